@@ -4,6 +4,7 @@ import dataclasses
 import json
 import pathlib
 import time
+from collections.abc import Iterable
 
 import aiosqlite
 
@@ -79,11 +80,8 @@ class PatternDatabase:
 
         Extra fields in the table are ignored.
         """
-        async with (
-            aiosqlite.connect(self.dbpath) as conn,
-            conn.execute("pragma table_info(patterns)") as cursor,
-        ):
-            field_info_list = await cursor.fetchall()
+        async with aiosqlite.connect(self.dbpath) as conn:
+            field_info_list = await conn.execute_fetchall("pragma table_info(patterns)")
 
         field_info_dict = {
             field_info[1]: (field_info[2].lower(), bool(field_info[-1])) for field_info in field_info_list
@@ -130,21 +128,42 @@ class PatternDatabase:
                 If >0 and there are more patterns in the database,
                 the oldest are purged.
         """
-        pattern_json = json.dumps(dataclasses.asdict(pattern))
-        cache_values = tuple(getattr(pattern, field) for field in CACHE_FIELD_NAMES)
+        await self.add_patterns([pattern], max_entries=max_entries)
+
+    async def add_patterns(
+        self,
+        patterns: Iterable[ReducedPattern],
+        max_entries: int = 0,
+    ) -> None:
+        """Add new patterns to the database in a single transaction.
+
+        The result is the same as calling `add_pattern` for each pattern
+        in order, but much faster when adding many patterns.
+
+        Args:
+            patterns: The patterns to add, oldest first.
+                See `add_pattern` for details.
+            max_entries: Maximum number of patterns to keep; no limit if 0.
+                If >0 and there are more patterns in the database,
+                the oldest are purged.
+        """
         current_time = time.time()
         async with aiosqlite.connect(self.dbpath) as conn:
-            await conn.execute("delete from patterns where pattern_name = ?", (pattern.name,))
+            for pattern in patterns:
+                pattern_json = json.dumps(dataclasses.asdict(pattern))
+                cache_values = tuple(getattr(pattern, field) for field in CACHE_FIELD_NAMES)
+                await conn.execute("delete from patterns where pattern_name = ?", (pattern.name,))
+                await conn.execute(
+                    INSERT_STR,
+                    (pattern.name, pattern_json, *cache_values, current_time),
+                )
+            await conn.commit()
+
             # If limiting the number of entries, make sure to allow
             # at least two, to save the most recent pattern,
             # since it is likely to be the current pattern.
             if max_entries > 0:
                 max_entries = max(max_entries, 2)
-            await conn.execute(
-                INSERT_STR,
-                (pattern.name, pattern_json, *cache_values, current_time),
-            )
-            await conn.commit()
 
             pattern_names = await self.get_pattern_names()
             names_to_delete = pattern_names[0:-max_entries]
@@ -165,10 +184,10 @@ class PatternDatabase:
         """Get the named pattern."""
         async with aiosqlite.connect(self.dbpath) as conn:
             conn.row_factory = aiosqlite.Row
-            async with conn.execute(
-                "select * from patterns where pattern_name = ?", (pattern_name,)
-            ) as cursor:
-                row = await cursor.fetchone()
+            rows = await conn.execute_fetchall(
+                "select * from patterns where pattern_name = ? limit 1", (pattern_name,)
+            )
+        row = next(iter(rows), None)
         if row is None:
             raise LookupError(f"{pattern_name} not found")
         pattern_dict = json.loads(row["pattern_json"])
@@ -183,11 +202,10 @@ class PatternDatabase:
 
     async def get_pattern_names(self) -> list[str]:
         """Get all pattern names."""
-        async with (
-            aiosqlite.connect(self.dbpath) as conn,
-            conn.execute("select pattern_name from patterns order by timestamp_sec asc, id asc") as cursor,
-        ):
-            rows = await cursor.fetchall()
+        async with aiosqlite.connect(self.dbpath) as conn:
+            rows = await conn.execute_fetchall(
+                "select pattern_name from patterns order by timestamp_sec asc, id asc"
+            )
 
         return [row[0] for row in rows]
 
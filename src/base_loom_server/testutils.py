@@ -1,29 +1,33 @@
+import asyncio
 import base64
 import contextlib
 import copy
 import dataclasses
+import functools
 import importlib.resources
 import itertools
 import json
 import pathlib
 import random
+import shutil
 import sys
 import tempfile
-from collections.abc import Generator, Iterable
+from collections.abc import Callable, Generator, Iterable, Iterator
 from importlib.resources.abc import Traversable
-from types import SimpleNamespace
 from typing import Any, TypeAlias
 
 import pytest
-from dtx_to_wif import read_pattern_file
+from dtx_to_wif import PatternData, read_pattern_file
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from fastapi.websockets import WebSocket
 from starlette.testclient import WebSocketTestSession
 
+from . import client_replies
 from .base_loom_server import MAX_THREAD_GROUP_SIZE, SETTINGS_FILE_NAME, BaseLoomServer
 from .base_mock_loom import BaseMockLoom
 from .enums import ConnectionStateEnum, DirectionControlEnum, MessageSeverityEnum, ModeEnum, ShaftStateEnum
+from .pattern_database import CACHE_FIELD_NAMES, create_pattern_database
 from .reduced_pattern import (
     DEFAULT_THREAD_GROUP_SIZE,
     NUM_ITEMS_FOR_REPEAT_SEPARATOR,
@@ -32,17 +36,77 @@ from .reduced_pattern import (
 )
 from .utils import compute_total_num, get_version
 
+# orjson is much faster than the standard library json module,
+# but is optional, because loom packages that use testutils may not have it.
+try:
+    from orjson import dumps as _orjson_dumps
+    from orjson import loads as _json_loads
+
+    def _json_dumps(data: dict[str, Any]) -> str:
+        return _orjson_dumps(data).decode()
+
+except ImportError:
+    from json import dumps as _json_dumps  # type: ignore[assignment]
+    from json import loads as _json_loads  # type: ignore[assignment]
+
 WebSocketType: TypeAlias = WebSocket | WebSocketTestSession
 
 _PKG_NAME = "base_loom_server"
 TEST_DATA_FILES = importlib.resources.files(_PKG_NAME) / "test_data" / "pattern_files"
 
-# in Python 3.11 mypy complains: "Traversable" has no attribute "glob"
-ALL_PATTERN_PATHS: tuple[pathlib.Path, ...] = (
-    *TEST_DATA_FILES.glob("*.wif"),  # type: ignore[attr-defined]
-    *TEST_DATA_FILES.glob("*.dtx"),  # type: ignore[attr-defined]
-    *TEST_DATA_FILES.glob("*.wpo"),  # type: ignore[attr-defined]
+_PATTERN_SUFFIXES = (".wif", ".dtx", ".wpo")
+
+# Read the directory once, and sort by suffix then name,
+# so that the order is deterministic (tests index this by position).
+ALL_PATTERN_PATHS: tuple[Traversable, ...] = tuple(
+    sorted(
+        (path for path in TEST_DATA_FILES.iterdir() if path.name.endswith(_PATTERN_SUFFIXES)),
+        key=lambda path: (_PATTERN_SUFFIXES.index(path.name[path.name.rfind(".") :]), path.name),
+    )
+)
+
+
+# Names of the data fields (all but "type") of the jump replies.
+# These should all be None when a client connects.
+_JUMP_END_NUMBER_DATA_FIELD_NAMES = tuple(
+    field.name for field in dataclasses.fields(client_replies.JumpEndNumber) if field.name != "type"
+)
+_JUMP_PICK_NUMBER_DATA_FIELD_NAMES = tuple(
+    field.name for field in dataclasses.fields(client_replies.JumpPickNumber) if field.name != "type"
+)
+
+# Reply types the loom server always sends when a client connects.
+_INITIAL_REPLY_TYPES = frozenset(
+    (
+        "Direction",
+        "JumpEndNumber",
+        "JumpPickNumber",
+        "JumpTabbyPickNumber",
+        "LanguageNames",
+        "LoomConnectionState",
+        "LoomInfo",
+        "Mode",
+        "PatternNames",
+        "Settings",
+        "ShaftState",
+        "Version",
+        "WiFi",
+    )
 )
+# Additional reply types the loom server sends when a client connects,
+# if there is a current pattern.
+_CURRENT_PATTERN_REPLY_TYPES = frozenset(
+    (
+        "CurrentEndNumber",
+        "CurrentPickNumber",
+        "CurrentTabbyPickNumber",
+        "ReducedPattern",
+        "SeparateThreadingRepeats",
+        "SeparateWeavingRepeats",
+        "ThreadGroupSize",
+    )
+)
+_GOOD_INITIAL_CONNECTION_STATES = frozenset((ConnectionStateEnum.CONNECTING, ConnectionStateEnum.CONNECTED))
 
 
 def assert_replies_equal(reply: dict[str, Any], expected_reply: dict[str, Any]) -> None:
@@ -55,9 +119,192 @@ def assert_replies_equal(reply: dict[str, Any], expected_reply: dict[str, Any])
             raise AssertionError(f"{reply=} != {expected_reply}: failed on field {key!r}")
 
 
+def make_current_pattern_replies(pattern: ReducedPattern) -> dict[str, dict[str, Any]]:
+    """Make the replies that report the state of the current pattern.
+
+    These are the replies the loom server sends (after the ReducedPattern)
+    when a pattern is selected, and when a client connects.
+
+    Args:
+        pattern: The current pattern.
+
+    Returns:
+        replies: A dict of reply type: reply dict.
+    """
+    return {
+        reply.type: dataclasses.asdict(reply)
+        for reply in (
+            client_replies.CurrentEndNumber(
+                total_end_number0=compute_total_num(
+                    num_within=pattern.end_number0,
+                    repeat_number=pattern.end_repeat_number,
+                    repeat_len=pattern.num_ends,
+                ),
+                total_end_number1=compute_total_num(
+                    num_within=pattern.end_number1,
+                    repeat_number=pattern.end_repeat_number,
+                    repeat_len=pattern.num_ends,
+                ),
+                end_number0=pattern.end_number0,
+                end_number1=pattern.end_number1,
+                end_repeat_number=pattern.end_repeat_number,
+            ),
+            client_replies.CurrentPickNumber(
+                total_pick_number=compute_total_num(
+                    num_within=pattern.pick_number,
+                    repeat_number=pattern.pick_repeat_number,
+                    repeat_len=len(pattern.picks),
+                ),
+                pick_number=pattern.pick_number,
+                pick_repeat_number=pattern.pick_repeat_number,
+            ),
+            client_replies.CurrentTabbyPickNumber(tabby_pick_number=pattern.tabby_pick_number),
+            client_replies.SeparateThreadingRepeats(separate=pattern.separate_threading_repeats),
+            client_replies.SeparateWeavingRepeats(separate=pattern.separate_weaving_repeats),
+            client_replies.ThreadGroupSize(group_size=pattern.thread_group_size),
+        )
+    }
+
+
+def assert_pattern_state_equal(pattern: ReducedPattern, expected_pattern: ReducedPattern) -> None:
+    """Assert that two patterns are equal, checking the name and
+    weaving and threading state first.
+
+    The state fields are the ones a test is likely to change,
+    so check them one at a time, for a clear error message,
+    before checking the bulk pattern data (such as picks and threading).
+    """
+    if pattern is expected_pattern:
+        return
+    for field_name in ("name", *CACHE_FIELD_NAMES):
+        value = getattr(pattern, field_name)
+        expected_value = getattr(expected_pattern, field_name)
+        if value != expected_value:
+            raise AssertionError(f"{field_name}={value!r} != {expected_value!r} for pattern {pattern.name!r}")
+    assert pattern == expected_pattern
+
+
+async def seed_database(*, db_path: pathlib.Path, patterns: Iterable[ReducedPattern]) -> None:
+    """Add patterns directly to a pattern database, creating it if needed.
+
+    Args:
+        db_path: Path to the pattern database.
+        patterns: Patterns to add, oldest first.
+    """
+    pattern_db = await create_pattern_database(db_path)
+    await pattern_db.add_patterns(patterns)
+
+
+def compute_pick_sequence(
+    pattern: ReducedPattern, *, direction_forward: bool, end_repeat_number: int | None = None
+) -> list[tuple[int, int]]:
+    """Compute the (pick_number, pick_repeat_number) of successive picks.
+
+    Start from the current pick of `pattern`, but do not change `pattern`.
+
+    Args:
+        pattern: Pattern to weave.
+        direction_forward: Weaving direction.
+        end_repeat_number: Stop at the first pick in this pattern repeat.
+            Required if weaving forward, in which case it must be larger
+            than the current pick repeat number. If None, stop at the start
+            of the pattern (which is only reached weaving backward).
+
+    Raises:
+        ValueError: If weaving forward and `end_repeat_number` is None
+            or not larger than the current pick repeat number.
+    """
+    if direction_forward:
+        # Weaving forward never ends, so make sure we reach end_repeat_number
+        if end_repeat_number is None:
+            raise ValueError("end_repeat_number is required if weaving forward")
+        if end_repeat_number <= pattern.pick_repeat_number:
+            raise ValueError(
+                f"{end_repeat_number=} must be > {pattern.pick_repeat_number=} if weaving forward"
+            )
+    pattern = copy.copy(pattern)
+    sequence: list[tuple[int, int]] = []
+    while pattern.pick_repeat_number != end_repeat_number:
+        try:
+            pattern.increment_pick_number(direction_forward=direction_forward)
+        except IndexError:
+            break
+        sequence.append((pattern.pick_number, pattern.pick_repeat_number))
+    return sequence
+
+
+def _as_path(filepath: Traversable) -> pathlib.Path:
+    """Convert a pattern file path to a pathlib.Path, for use as a cache key.
+
+    The test pattern files are installed as ordinary files,
+    so str(filepath) is their path on disk.
+    """
+    return pathlib.Path(str(filepath))
+
+
+@functools.cache
+def _read_upload_data(filepath: pathlib.Path) -> str:
+    """Read a pattern file as data for the upload command.
+
+    Cached, because many tests upload the same pattern files.
+    """
+    if filepath.name.endswith(".wpo"):
+        raw_data = filepath.read_bytes()
+        return base64.b64encode(raw_data).decode("ascii")
+    return filepath.read_text(encoding="utf_8")
+
+
+def read_full_pattern(filepath: Traversable) -> PatternData:
+    """Read a pattern file.
+
+    Each pattern file is only parsed once; callers must not modify the result.
+
+    Args:
+        filepath: Path to pattern file.
+    """
+    return _read_full_pattern(_as_path(filepath))
+
+
+@functools.cache
+def _read_full_pattern(filepath: pathlib.Path) -> PatternData:
+    """Read a pattern file. Cached; callers must not modify the result."""
+    return read_pattern_file(filepath)
+
+
+@functools.cache
+def _read_reduced_pattern(filepath: pathlib.Path) -> ReducedPattern:
+    """Read a pattern file and convert it to a ReducedPattern.
+
+    Cached; callers must not modify the returned pattern.
+    """
+    return reduced_pattern_from_pattern_data(name=filepath.name, data=_read_full_pattern(filepath))
+
+
+def read_reduced_pattern(filepath: Traversable) -> ReducedPattern:
+    """Read a pattern file and convert it to a ReducedPattern.
+
+    Each pattern file is only parsed once; return a new copy each time.
+
+    Args:
+        filepath: Path to pattern file.
+    """
+    return copy.deepcopy(_read_reduced_pattern(_as_path(filepath)))
+
+
+def make_upload_command(filepath: Traversable) -> dict[str, Any]:
+    """Make an upload command for a pattern file.
+
+    Args:
+        filepath: Path to pattern file.
+    """
+    return dict(type="upload", name=filepath.name, data=_read_upload_data(_as_path(filepath)))
+
+
 class Client:
     """Client for testing loom servers."""
 
+    __slots__ = ("loom_server", "mock_loom", "test_client", "websocket")
+
     def __init__(
         self,
         test_client: TestClient,
@@ -71,13 +318,26 @@ class Client:
         self.websocket = websocket
 
     def send_dict(self, datadict: dict[str, Any]) -> None:
-        """Write a dict as json."""
-        self.websocket.send_json(datadict)
+        """Write a dict as json.
+
+        Use orjson, if available, which is much faster than the standard
+        library json used by the websocket's send_json method.
+        """
+        self.websocket.send_text(_json_dumps(datadict))
 
     def receive_dict(self) -> dict[str, Any]:
-        """Read json as a dict."""
-        data: Any = self.websocket.receive_json()
-        assert isinstance(data, dict)
+        """Read json as a dict.
+
+        Intern the value of the "type" field, so that looking it up
+        in dicts and sets of reply type names is an identity check.
+        """
+        text = self.websocket.receive_text()
+        # WebSocketType includes async WebSocket, whose receive_text returns a coroutine
+        assert isinstance(text, str)
+        data: Any = _json_loads(text)
+        reply_type = data.get("type")
+        if isinstance(reply_type, str):
+            data["type"] = sys.intern(reply_type)
         return data
 
     def change_direction(self) -> None:
@@ -156,8 +416,6 @@ class Client:
                 expected_replies += [
                     dict(
                         type="JumpEndNumber",
-                        end_number0=None,
-                        end_repeat_number=None,
                     ),
                 ]
             num_ends_in_pattern = len(pattern.threading)
@@ -186,12 +444,10 @@ class Client:
                 dict(
                     type="ShaftState",
                     state=ShaftStateEnum.MOVING,
-                    shaft_word=None,
                 ),
                 dict(
                     type="ShaftState",
                     state=ShaftStateEnum.MOVING,
-                    shaft_word=None,
                 ),
             ]
         expected_replies += [
@@ -233,73 +489,72 @@ class Client:
 
         replies = self.send_command(dict(type="oobcommand", command="n"))
         assert len(replies) == 1
-        expected_replies: list[dict[str, Any]] = []
+        for expected_reply in self._iter_next_pick_replies(
+            pattern=pattern,
+            expected_pick_number=expected_pick_number,
+            expected_repeat_number=expected_repeat_number,
+            jump_pending=jump_pending,
+            should_fail=should_fail,
+        ):
+            reply = self.receive_dict()
+            if reply["type"] == "ServerMessage" and reply["severity"] == MessageSeverityEnum.INFO:
+                # Ignore info-level status messages
+                continue
+            assert_replies_equal(reply, expected_reply)
 
-        expected_shaft_word = pattern.get_pick(expected_pick_number).shaft_word
+    def _iter_next_pick_replies(
+        self,
+        *,
+        pattern: ReducedPattern,
+        expected_pick_number: int,
+        expected_repeat_number: int,
+        jump_pending: bool,
+        should_fail: bool,
+    ) -> Iterator[dict[str, Any]]:
+        """Generate the expected replies to a next pick command, in order.
 
+        See `command_next_pick` for details.
+        """
+        loom_server = self.loom_server
+        mock_direction_forward = self.mock_loom.direction_forward
         if (
-            not self.loom_server.enable_software_direction
-            and not self.loom_server.loom_reports_direction
-            and self.loom_server.direction_forward != self.mock_loom.direction_forward
+            not loom_server.enable_software_direction
+            and not loom_server.loom_reports_direction
+            and loom_server.direction_forward != mock_direction_forward
         ):
             # Loom only reports direction when it asks for a pick
             # and the direction has changed
-            expected_replies += [
-                dict(
-                    type="Direction",
-                    forward=self.mock_loom.direction_forward,
-                )
-            ]
+            yield dict(
+                type="Direction",
+                forward=mock_direction_forward,
+            )
         if should_fail:
-            expected_replies += [
-                dict(
-                    message="At start of weaving",
-                    severity=MessageSeverityEnum.ERROR,
-                ),
-            ]
+            yield dict(
+                message="At start of weaving",
+                severity=MessageSeverityEnum.ERROR,
+            )
         else:
             if jump_pending:
-                expected_replies += [
-                    dict(
-                        type="JumpPickNumber",
-                        pick_number=None,
-                        pick_repeat_number=None,
-                    ),
-                ]
-            expected_replies += [
-                dict(
-                    type="CurrentPickNumber",
-                    pick_number=expected_pick_number,
-                    total_pick_number=None,
-                    pick_repeat_number=expected_repeat_number,
-                ),
-            ]
-        if self.loom_server.loom_reports_motion:
-            expected_replies += [
-                dict(
-                    type="ShaftState",
-                    state=ShaftStateEnum.MOVING,
-                    shaft_word=None,
-                ),
-                dict(
-                    type="ShaftState",
-                    state=ShaftStateEnum.MOVING,
-                    shaft_word=None,
-                ),
-            ]
-        expected_replies += [
-            dict(
+                yield dict(
+                    type="JumpPickNumber",
+                )
+            yield dict(
+                type="CurrentPickNumber",
+                pick_number=expected_pick_number,
+                pick_repeat_number=expected_repeat_number,
+            )
+        if loom_server.loom_reports_motion:
+            moving_reply = dict(
                 type="ShaftState",
-                state=ShaftStateEnum.DONE,
-                shaft_word=expected_shaft_word,
-            ),
-        ]
-        for expected_reply in expected_replies:
-            reply = self.receive_dict()
-            if reply["type"] == "ServerMessage" and reply["severity"] == MessageSeverityEnum.INFO:
-                # Ignore info-level status messages
-                continue
-            assert_replies_equal(reply, expected_reply)
+                state=ShaftStateEnum.MOVING,
+            )
+            yield moving_reply
+            yield moving_reply
+        yield dict(
+            type="ShaftState",
+            state=ShaftStateEnum.DONE,
+            shaft_word=pattern.get_pick(expected_pick_number).shaft_word,
+        )
 
     def command_next_tabby_pick(
         self,
@@ -353,7 +608,6 @@ class Client:
                 expected_replies += [
                     dict(
                         type="JumpTabbyPickNumber",
-                        tabby_pick_number=None,
                     ),
                 ]
             expected_replies += [
@@ -367,12 +621,10 @@ class Client:
                 dict(
                     type="ShaftState",
                     state=ShaftStateEnum.MOVING,
-                    shaft_word=None,
                 ),
                 dict(
                     type="ShaftState",
                     state=ShaftStateEnum.MOVING,
-                    shaft_word=None,
                 ),
             ]
         expected_replies += [
@@ -472,46 +724,19 @@ class Client:
             assert bool(pattern_in_reply.separate_weaving_repeats) == (
                 len(pattern_in_reply.picks) > NUM_ITEMS_FOR_REPEAT_SEPARATOR
             )
+        expected_replies = make_current_pattern_replies(pattern_in_reply)
         seen_types: set[str] = {"ReducedPattern"}
-        for reply_dict in replies[1:]:
-            reply = SimpleNamespace(**reply_dict)
-            match reply.type:
-                case "CommandDone":
-                    assert reply.cmd_type == "select_pattern"
-                    assert reply.success
-                case "CurrentPickNumber":
-                    assert reply.pick_number == pattern_in_reply.pick_number
-                    assert reply.pick_repeat_number == pattern_in_reply.pick_repeat_number
-                    assert reply.total_pick_number == compute_total_num(
-                        num_within=pattern_in_reply.pick_number,
-                        repeat_number=pattern_in_reply.pick_repeat_number,
-                        repeat_len=len(pattern_in_reply.picks),
-                    )
-                case "CurrentTabbyPickNumber":
-                    assert reply.tabby_pick_number == pattern_in_reply.tabby_pick_number
-                case "CurrentEndNumber":
-                    assert reply.end_number0 == pattern_in_reply.end_number0
-                    assert reply.end_number1 == pattern_in_reply.end_number1
-                    assert reply.end_repeat_number == pattern_in_reply.end_repeat_number
-                    assert reply.total_end_number0 == compute_total_num(
-                        num_within=pattern_in_reply.end_number0,
-                        repeat_number=pattern_in_reply.end_repeat_number,
-                        repeat_len=pattern_in_reply.num_ends,
-                    )
-                    assert reply.total_end_number1 == compute_total_num(
-                        num_within=pattern_in_reply.end_number1,
-                        repeat_number=pattern_in_reply.end_repeat_number,
-                        repeat_len=pattern_in_reply.num_ends,
-                    )
-                case "SeparateThreadingRepeats":
-                    assert reply.separate == pattern_in_reply.separate_threading_repeats
-                case "SeparateWeavingRepeats":
-                    assert reply.separate == pattern_in_reply.separate_weaving_repeats
-                case "ThreadGroupSize":
-                    assert reply.group_size == pattern_in_reply.thread_group_size
-                case _:
-                    raise AssertionError(f"Unexpected message type {reply.type}")
-            seen_types.add(reply.type)
+        for reply in replies[1:]:
+            reply_type = reply["type"]
+            if reply_type == "CommandDone":
+                assert reply["cmd_type"] == "select_pattern"
+                assert reply["success"]
+            else:
+                expected_reply = expected_replies.get(reply_type)
+                if expected_reply is None:
+                    raise AssertionError(f"Unexpected message type {reply_type}")
+                assert reply == expected_reply
+            seen_types.add(reply_type)
         assert seen_types == expected_seen_types
         assert self.loom_server.current_pattern is not None
         return self.loom_server.current_pattern
@@ -529,6 +754,21 @@ class Client:
             The final reply will be CommandDone and its success flag is checked
         """
         self.send_dict(cmd_dict)
+        return self.read_command_replies(cmd_dict, should_fail=should_fail)
+
+    def read_command_replies(
+        self, cmd_dict: dict[str, Any], *, should_fail: bool = False
+    ) -> list[dict[str, Any]]:
+        """Read all replies to a command that has been sent.
+
+        Args:
+            cmd_dict: The command that was sent, as a dict.
+            should_fail: If true, the command should fail.
+
+        Returns:
+            replies: a list of replies (as dicts).
+            The final reply will be CommandDone and its success flag is checked
+        """
         replies: list[dict[str, Any]] = []
         while True:
             reply = self.receive_dict()
@@ -559,14 +799,8 @@ class Client:
             should_fail: If true, upload should fail (and `expected_names`
                 is ignored).
         """
-        suffix = pathlib.Path(str(filepath)).suffix
-        if suffix == ".wpo":
-            raw_data = filepath.read_bytes()
-            data = base64.b64encode(raw_data).decode("ascii")
-        else:
-            data = filepath.read_text(encoding="utf_8")
         replies = self.send_command(
-            dict(type="upload", name=filepath.name, data=data),
+            make_upload_command(filepath),
             should_fail=should_fail,
         )
         if should_fail:
@@ -575,6 +809,194 @@ class Client:
             assert len(replies) == 2  # noqa: PLR2004
             assert replies[0] == dict(type="PatternNames", names=list(expected_names))
 
+    def upload_patterns(
+        self,
+        *,
+        filepaths: Iterable[Traversable],
+        initial_names: Iterable[str] = (),
+    ) -> None:
+        """Upload patterns to the loom server.
+
+        Send all of the upload commands before reading any replies,
+        rather than waiting for the replies to each command in turn.
+        Send each command as soon as it is made, so the loom server
+        can process it while the next pattern file is read.
+        The loom server executes commands in order, so the replies
+        are the same as uploading one pattern at a time. Check the replies.
+
+        Args:
+            filepaths: Paths to pattern files.
+            initial_names: Pattern names in the database before the upload.
+        """
+        cmd_dicts: list[dict[str, Any]] = []
+        for filepath in filepaths:
+            cmd_dict = make_upload_command(filepath)
+            self.send_dict(cmd_dict)
+            cmd_dicts.append(cmd_dict)
+        expected_names = list(initial_names)
+        for cmd_dict in cmd_dicts:
+            expected_names.append(cmd_dict["name"])
+            replies = self.read_command_replies(cmd_dict)
+            assert len(replies) == 2  # noqa: PLR2004
+            assert replies[0] == dict(type="PatternNames", names=expected_names)
+
+
+class InitialReplyChecker:
+    """Check the replies a loom server sends when a client connects.
+
+    Args:
+        loom_server: The loom server.
+        expected_status_messages: Expected status messages, in order.
+            All should have severity level INFO.
+        expected_pattern_names: Expected pattern names, in order.
+        expected_current_pattern: Expected current pattern, if any.
+
+    Attributes:
+        expected_types: The reply types that should be seen.
+        seen_types: The reply types seen so far.
+        num_status_messages_seen: The number of status messages seen so far.
+    """
+
+    def __init__(
+        self,
+        *,
+        loom_server: BaseLoomServer,
+        expected_status_messages: Iterable[str],
+        expected_pattern_names: list[str],
+        expected_current_pattern: ReducedPattern | None,
+    ) -> None:
+        self.loom_server = loom_server
+        self.expected_status_messages = tuple(expected_status_messages)
+        self.expected_pattern_names = expected_pattern_names
+        self.expected_current_pattern = expected_current_pattern
+
+        self.expected_types = _INITIAL_REPLY_TYPES
+        if self.expected_status_messages:
+            self.expected_types |= {"StatusMessage"}
+        if expected_current_pattern:
+            self.expected_types |= _CURRENT_PATTERN_REPLY_TYPES
+        self.good_connection_states = _GOOD_INITIAL_CONNECTION_STATES
+        self.seen_types: set[str] = set()
+        self.num_status_messages_seen = 0
+        self._expected_status_messages_iter = iter(self.expected_status_messages)
+
+        # Compute the expected current pattern replies once,
+        # since expected_current_pattern does not change.
+        self.expected_current_pattern_replies = (
+            {} if expected_current_pattern is None else make_current_pattern_replies(expected_current_pattern)
+        )
+
+        # Dict of reply type: check method
+        all_check_methods: dict[str, Callable[[dict[str, Any]], None]] = dict(
+            CurrentEndNumber=self._check_current_pattern_reply,
+            CurrentPickNumber=self._check_current_pattern_reply,
+            CurrentTabbyPickNumber=self._check_current_pattern_reply,
+            Direction=self._check_direction,
+            JumpEndNumber=self._check_jump_end_number,
+            JumpPickNumber=self._check_jump_pick_number,
+            JumpTabbyPickNumber=self._check_jump_tabby_pick_number,
+            LanguageNames=self._check_language_names,
+            LoomConnectionState=self._check_loom_connection_state,
+            LoomInfo=self._check_loom_info,
+            Mode=self._check_mode,
+            PatternNames=self._check_pattern_names,
+            ReducedPattern=self._check_reduced_pattern,
+            SeparateThreadingRepeats=self._check_current_pattern_reply,
+            SeparateWeavingRepeats=self._check_current_pattern_reply,
+            Settings=self._check_settings,
+            ShaftState=self._check_shaft_state,
+            StatusMessage=self._check_status_message,
+            ThreadGroupSize=self._check_current_pattern_reply,
+            Version=self._check_version,
+            WiFi=self._check_wifi,
+        )
+        # Only include the expected reply types,
+        # so the dispatch also rejects unexpected types.
+        self.check_methods = {
+            reply_type: check_method
+            for reply_type, check_method in all_check_methods.items()
+            if reply_type in self.expected_types
+        }
+
+    def check(self, reply: dict[str, Any]) -> None:
+        """Check one reply."""
+        reply_type = reply["type"]
+        check_method = self.check_methods.get(reply_type)
+        if check_method is None:
+            raise AssertionError(f"Unexpected message type {reply_type}")
+        check_method(reply)
+        self.seen_types.add(reply_type)
+
+    def check_done(self) -> None:
+        """Check that all expected replies have been seen."""
+        assert self.seen_types == self.expected_types
+        assert self.num_status_messages_seen == len(self.expected_status_messages)
+
+    def _check_current_pattern_reply(self, reply: dict[str, Any]) -> None:
+        assert reply == self.expected_current_pattern_replies[reply["type"]]
+
+    def _check_direction(self, reply: dict[str, Any]) -> None:
+        assert reply["forward"]
+
+    def _check_jump_end_number(self, reply: dict[str, Any]) -> None:
+        for field_name in _JUMP_END_NUMBER_DATA_FIELD_NAMES:
+            assert reply[field_name] is None
+
+    def _check_jump_pick_number(self, reply: dict[str, Any]) -> None:
+        for field_name in _JUMP_PICK_NUMBER_DATA_FIELD_NAMES:
+            assert reply[field_name] is None
+
+    def _check_jump_tabby_pick_number(self, reply: dict[str, Any]) -> None:
+        assert reply["tabby_pick_number"] is None
+
+    def _check_language_names(self, reply: dict[str, Any]) -> None:
+        assert "English" in reply["languages"]
+
+    def _check_loom_connection_state(self, reply: dict[str, Any]) -> None:
+        if reply["state"] not in self.good_connection_states:
+            raise AssertionError(f"Unexpected state in {reply=}; should be in {self.good_connection_states}")
+
+    def _check_loom_info(self, reply: dict[str, Any]) -> None:
+        assert reply == dataclasses.asdict(self.loom_server.loom_info)
+
+    def _check_mode(self, reply: dict[str, Any]) -> None:
+        assert reply["mode"] == ModeEnum.WEAVE_PATTERN
+
+    def _check_pattern_names(self, reply: dict[str, Any]) -> None:
+        assert reply["names"] == self.expected_pattern_names
+
+    def _check_reduced_pattern(self, reply: dict[str, Any]) -> None:
+        if not self.expected_pattern_names:
+            raise AssertionError(
+                f"Unexpected message type {reply['type']} because expected_current_pattern is None"
+            )
+        assert reply["name"] == self.expected_pattern_names[-1]
+
+    def _check_settings(self, reply: dict[str, Any]) -> None:
+        assert reply == dataclasses.asdict(self.loom_server.settings)
+
+    def _check_shaft_state(self, reply: dict[str, Any]) -> None:
+        assert reply["state"] == (
+            ShaftStateEnum.DONE if self.loom_server.loom_reports_motion else ShaftStateEnum.UNKNOWN
+        )
+        assert reply["shaft_word"] == 0
+
+    def _check_status_message(self, reply: dict[str, Any]) -> None:
+        self.num_status_messages_seen += 1
+        expected_message = next(self._expected_status_messages_iter, None)
+        if expected_message is None:
+            raise AssertionError(f"Unexpected status message {reply=}")
+        assert reply["message"] == expected_message
+        assert reply["severity"] == MessageSeverityEnum.INFO
+
+    def _check_version(self, reply: dict[str, Any]) -> None:
+        assert reply["main_package_name"] != "?"
+        assert reply["base_loom_server_version"] == get_version("base_loom_server")
+        assert reply["dtx_to_wif_version"] == get_version("dtx_to_wif")
+
+    def _check_wifi(self, reply: dict[str, Any]) -> None:
+        assert not reply["supported"]
+
 
 class BaseTestLoomServer:
     """Base class for server tests.
@@ -589,6 +1011,33 @@ class BaseTestLoomServer:
     app: FastAPI | None = None
     extra_args = ()
 
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        # Catch a missing app when the test class is defined,
+        # rather than in every test. Only check test classes
+        # (names beginning with Test), to allow intermediate base classes.
+        if cls.__name__.startswith("Test") and cls.app is None:
+            raise TypeError(
+                f"{cls.__name__}.app is None; you must set it to the FastAPI app for your loom server"
+            )
+
+    @pytest.fixture(scope="class")
+    def uploaded_db_path(self, tmp_path_factory: pytest.TempPathFactory) -> pathlib.Path:
+        """Make a pattern database by uploading all patterns in ALL_PATTERN_PATHS.
+
+        The uploads are checked, so this is also the main upload test.
+        The database is shared by all tests in the class, so do not modify it;
+        use `create_test_client_from_uploaded_db` to run the loom server on a copy.
+        """
+        db_path = tmp_path_factory.mktemp("uploaded_db") / "loom_server_database.sqlite"
+        with self.create_test_client(
+            app=self.app,
+            upload_patterns=ALL_PATTERN_PATHS,
+            db_path=db_path,
+        ) as _:
+            pass
+        return db_path
+
     def test_jump_to_end(self) -> None:
         """Test the jump_to_end command."""
         pattern_name = ALL_PATTERN_PATHS[4].name
@@ -634,10 +1083,10 @@ class BaseTestLoomServer:
                     dict(type="jump_to_end", total_end_number0=total_end_number0),
                 )
                 assert len(replies) == 2  # noqa: PLR2004
-                jump_end_reply = SimpleNamespace(**replies[0])
+                jump_end_reply = replies[0]
                 if total_end_number0 == 0:
                     # Jump to warp thread_number0 0, repeat_number 1.
-                    assert jump_end_reply == SimpleNamespace(
+                    assert jump_end_reply == dict(
                         type="JumpEndNumber",
                         total_end_number0=0,
                         total_end_number1=0,
@@ -649,7 +1098,7 @@ class BaseTestLoomServer:
                     # Jump to warp thread_number0 0, repeat_number not 1.
                     # Report the last end of the previous repeat,
                     # rather than the magic "0" end_number0
-                    assert jump_end_reply == SimpleNamespace(
+                    assert jump_end_reply == dict(
                         type="JumpEndNumber",
                         total_end_number0=total_end_number0,
                         total_end_number1=total_end_number0,
@@ -660,7 +1109,7 @@ class BaseTestLoomServer:
                 else:
                     end_delta = pattern.compute_end_number1(end_number0) - end_number0
                     # Jump to a nonzero end_number0.
-                    assert jump_end_reply == SimpleNamespace(
+                    assert jump_end_reply == dict(
                         type="JumpEndNumber",
                         total_end_number0=total_end_number0,
                         total_end_number1=total_end_number0 + end_delta,
@@ -672,8 +1121,8 @@ class BaseTestLoomServer:
                     case "cancel":
                         replies = client.send_command(dict(type="jump_to_end", total_end_number0=None))
                         assert len(replies) == 2  # noqa: PLR2004
-                        jump_end_cancel_reply = SimpleNamespace(**replies[0])
-                        assert jump_end_cancel_reply == SimpleNamespace(
+                        jump_end_cancel_reply = replies[0]
+                        assert jump_end_cancel_reply == dict(
                             type="JumpEndNumber",
                             total_end_number0=None,
                             total_end_number1=None,
@@ -685,9 +1134,9 @@ class BaseTestLoomServer:
                         # Test against jump_end_reply because we already
                         # checked that against expected values.
                         client.command_next_end(
-                            expected_end_number0=jump_end_reply.end_number0,
-                            expected_end_number1=jump_end_reply.end_number1,
-                            expected_repeat_number=jump_end_reply.end_repeat_number,
+                            expected_end_number0=jump_end_reply["end_number0"],
+                            expected_end_number1=jump_end_reply["end_number1"],
+                            expected_repeat_number=jump_end_reply["end_repeat_number"],
                             jump_pending=True,
                         )
                     case "nothing":
@@ -713,14 +1162,13 @@ class BaseTestLoomServer:
                         == current_end_data[field_name]
                     )
 
-    def test_jump_to_pick(self) -> None:
+    def test_jump_to_pick(self, uploaded_db_path: pathlib.Path) -> None:
         """Test the jump_to_pick command."""
         pattern_name = ALL_PATTERN_PATHS[3].name
 
-        with self.create_test_client(
-            app=self.app,
+        with self.create_test_client_from_uploaded_db(
+            uploaded_db_path=uploaded_db_path,
             num_shafts=32,
-            upload_patterns=ALL_PATTERN_PATHS[2:5],
         ) as client:
             pattern = client.select_pattern(pattern_name=pattern_name)
             num_picks_in_pattern = len(pattern.picks)
@@ -741,10 +1189,10 @@ class BaseTestLoomServer:
                 )
                 replies = client.send_command(dict(type="jump_to_pick", total_pick_number=total_pick_number))
                 assert len(replies) == 2  # noqa: PLR2004
-                jump_pick_reply = SimpleNamespace(**replies[0])
+                jump_pick_reply = replies[0]
                 if total_pick_number == 0:
                     # Jump to pick_number 0, repeat_number 1.
-                    assert jump_pick_reply == SimpleNamespace(
+                    assert jump_pick_reply == dict(
                         type="JumpPickNumber",
                         total_pick_number=0,
                         pick_number=0,
@@ -754,7 +1202,7 @@ class BaseTestLoomServer:
                     # Jump to pick_number 0, repeat_number not 1.
                     # Report the last pick of the previous repeat,
                     # rather than the magic "0" pick_number
-                    assert jump_pick_reply == SimpleNamespace(
+                    assert jump_pick_reply == dict(
                         type="JumpPickNumber",
                         total_pick_number=total_pick_number,
                         pick_number=num_picks_in_pattern,
@@ -762,7 +1210,7 @@ class BaseTestLoomServer:
                     )
                 else:
                     # Jump to a nonzero pick_number.
-                    assert jump_pick_reply == SimpleNamespace(
+                    assert jump_pick_reply == dict(
                         type="JumpPickNumber",
                         total_pick_number=total_pick_number,
                         pick_number=pick_number,
@@ -772,8 +1220,8 @@ class BaseTestLoomServer:
                     case "cancel":
                         replies = client.send_command(dict(type="jump_to_pick", total_pick_number=None))
                         assert len(replies) == 2  # noqa: PLR2004
-                        jump_pick_cancel_reply = SimpleNamespace(**replies[0])
-                        assert jump_pick_cancel_reply == SimpleNamespace(
+                        jump_pick_cancel_reply = replies[0]
+                        assert jump_pick_cancel_reply == dict(
                             type="JumpPickNumber",
                             total_pick_number=None,
                             pick_number=None,
@@ -781,8 +1229,8 @@ class BaseTestLoomServer:
                         )
                     case "next":
                         client.command_next_pick(
-                            expected_pick_number=jump_pick_reply.pick_number,
-                            expected_repeat_number=jump_pick_reply.pick_repeat_number,
+                            expected_pick_number=jump_pick_reply["pick_number"],
+                            expected_repeat_number=jump_pick_reply["pick_repeat_number"],
                             jump_pending=True,
                         )
                     case "nothing":
@@ -834,21 +1282,21 @@ class BaseTestLoomServer:
                     dict(type="jump_to_tabby_pick", tabby_pick_number=tabby_pick_number)
                 )
                 assert len(replies) == 2  # noqa: PLR2004
-                jump_pick_reply = SimpleNamespace(**replies[0])
-                assert jump_pick_reply == SimpleNamespace(
+                jump_pick_reply = replies[0]
+                assert jump_pick_reply == dict(
                     type="JumpTabbyPickNumber", tabby_pick_number=tabby_pick_number
                 )
                 match post_action:
                     case "cancel":
                         replies = client.send_command(dict(type="jump_to_tabby_pick", tabby_pick_number=None))
                         assert len(replies) == 2  # noqa: PLR2004
-                        jump_pick_cancel_reply = SimpleNamespace(**replies[0])
-                        assert jump_pick_cancel_reply == SimpleNamespace(
+                        jump_pick_cancel_reply = replies[0]
+                        assert jump_pick_cancel_reply == dict(
                             type="JumpTabbyPickNumber", tabby_pick_number=None
                         )
                     case "next":
                         client.command_next_tabby_pick(
-                            expected_pick_number=jump_pick_reply.tabby_pick_number, jump_pending=True
+                            expected_pick_number=jump_pick_reply["tabby_pick_number"], jump_pending=True
                         )
                     case "nothing":
                         pass
@@ -1022,37 +1470,29 @@ class BaseTestLoomServer:
             pattern = client.select_pattern(pattern_name=pattern_name)
 
             # Make enough forward picks to get into the 3rd repeat
-            expected_pick_number = 0
-            expected_repeat_number = 1
             assert client.loom_server.direction_forward
-            while True:
-                expected_pick_number, expected_repeat_number = pattern.compute_next_pick_numbers(
-                    direction_forward=True
-                )
+            for expected_pick_number, expected_repeat_number in compute_pick_sequence(
+                pattern, direction_forward=True, end_repeat_number=3
+            ):
                 client.command_next_pick(
                     expected_pick_number=expected_pick_number,
                     expected_repeat_number=expected_repeat_number,
                 )
-                if expected_repeat_number == 3:  # noqa: PLR2004
-                    break
+            assert pattern.pick_repeat_number == 3  # noqa: PLR2004
 
             client.change_direction()
             assert not client.loom_server.direction_forward
 
             # Now go backwards to the beginning
-            while True:
-                try:
-                    expected_pick_number, expected_repeat_number = pattern.compute_next_pick_numbers(
-                        direction_forward=False
-                    )
-                except IndexError:
-                    break
+            for expected_pick_number, expected_repeat_number in compute_pick_sequence(
+                pattern, direction_forward=False
+            ):
                 client.command_next_pick(
                     expected_pick_number=expected_pick_number,
                     expected_repeat_number=expected_repeat_number,
                 )
-            assert expected_pick_number == 0
-            assert expected_repeat_number == 1
+            assert pattern.pick_number == 0
+            assert pattern.pick_repeat_number == 1
 
             # Another advance should be rejected,
             # without changing the pick numbers in the pattern.
@@ -1061,8 +1501,8 @@ class BaseTestLoomServer:
                 expected_repeat_number=0,  # should be ignored
                 should_fail=True,
             )
-            assert pattern.pick_number == expected_pick_number
-            assert pattern.pick_repeat_number == expected_repeat_number
+            assert pattern.pick_number == 0
+            assert pattern.pick_repeat_number == 1
 
             # Change direction to forward
             client.change_direction()
@@ -1091,11 +1531,9 @@ class BaseTestLoomServer:
             assert not client.loom_server.direction_forward
 
             # Now go backwards to the beginning
-            expected_pick_number = pattern.tabby_pick_number
-            while expected_pick_number > 0:
-                expected_pick_number -= 1
+            for expected_pick_number in range(pattern.tabby_pick_number - 1, -1, -1):
                 client.command_next_tabby_pick(expected_pick_number=expected_pick_number)
-            assert expected_pick_number == 0
+            assert pattern.tabby_pick_number == 0
 
             # Another advance should be rejected,
             # without changing the pick numbers in the pattern.
@@ -1297,27 +1735,28 @@ class BaseTestLoomServer:
                         pattern_name=pattern.name,
                         check_defaults=False,
                     )
-                    assert returned_pattern == pattern
+                    assert_pattern_state_equal(returned_pattern, pattern)
 
             # Now try again, but this time reset the database
             with self.create_test_client(
                 app=self.app,
                 reset_db=True,
+                db_path=db_path,
             ) as client:
                 pass
 
     def test_select_pattern(self) -> None:
         """Test the select_pattern command."""
-        # Read a pattern file in and convert the data to a ReducedPattern
-        pattern_path = ALL_PATTERN_PATHS[1]
-        pattern_data = read_pattern_file(pattern_path)
-        reduced_pattern = reduced_pattern_from_pattern_data(name=pattern_path.name, data=pattern_data)
+        # Read the pattern files in and convert the data to ReducedPatterns.
+        # Seed the database with them, since uploading is tested elsewhere.
+        reduced_patterns = [read_reduced_pattern(pattern_path) for pattern_path in ALL_PATTERN_PATHS[0:3]]
+        reduced_pattern = reduced_patterns[1]
 
         with self.create_test_client(
             app=self.app,
-            upload_patterns=ALL_PATTERN_PATHS[0:3],
+            seed_patterns=reduced_patterns,
         ) as client:
-            selected_pattern = client.select_pattern(pattern_name=pattern_path.name)
+            selected_pattern = client.select_pattern(pattern_name=reduced_pattern.name)
             assert selected_pattern == reduced_pattern
 
     def test_settings_command(self) -> None:
@@ -1461,13 +1900,12 @@ class BaseTestLoomServer:
                         else:
                             assert getattr(client.loom_server.settings, key) == value
 
-    def test_upload(self) -> None:
-        """Test the upload command."""
-        with self.create_test_client(
-            app=self.app,
-            upload_patterns=ALL_PATTERN_PATHS,
-        ) as _:
-            pass
+    def test_upload(self, uploaded_db_path: pathlib.Path) -> None:
+        """Test the upload command.
+
+        Fixture `uploaded_db_path` uploads all of ALL_PATTERN_PATHS.
+        """
+        assert uploaded_db_path.is_file()
 
         # Test uploading a pattern file with too many shafts
         filename = "eighteen shaft liftplan.wif"
@@ -1497,6 +1935,52 @@ class BaseTestLoomServer:
                 assert replies[0]["type"] == "Direction"
                 assert replies[0]["forward"] == forward
 
+    @classmethod
+    def make_argv(cls, *, num_shafts: int, reset_db: bool, db_path: pathlib.Path | str) -> list[str]:
+        """Make the command-line arguments for the loom server.
+
+        Args:
+            num_shafts: The number of shafts that the loom has.
+            reset_db: Specify argument `--reset-db`?
+            db_path: `--db-path` argument value.
+        """
+        argv = ["testutils", str(num_shafts), "mock", "--verbose", *cls.extra_args]
+        if reset_db:
+            argv.append("--reset-db")
+        argv += ["--db-path", str(db_path)]
+        return argv
+
+    @classmethod
+    @contextlib.contextmanager
+    def create_test_client_from_uploaded_db(
+        cls,
+        *,
+        uploaded_db_path: pathlib.Path,
+        num_shafts: int = 24,
+    ) -> Generator[Client]:
+        """Create a test client whose loom server uses a copy of
+        the database made by fixture `uploaded_db_path`.
+
+        Args:
+            uploaded_db_path: Path to the database made by
+                fixture `uploaded_db_path`.
+            num_shafts: The number of shafts that the loom has.
+        """
+        # The loom server restores the most recently uploaded pattern
+        last_path = ALL_PATTERN_PATHS[-1]
+        expected_current_pattern = read_reduced_pattern(last_path)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = pathlib.Path(temp_dir) / uploaded_db_path.name
+            shutil.copyfile(uploaded_db_path, db_path)
+            with cls.create_test_client(
+                app=cls.app,
+                num_shafts=num_shafts,
+                db_path=db_path,
+                expected_pattern_names=[path.name for path in ALL_PATTERN_PATHS],
+                expected_current_pattern=expected_current_pattern,
+            ) as client:
+                yield client
+
     @classmethod
     @contextlib.contextmanager
     def create_test_client(
@@ -1505,7 +1989,8 @@ class BaseTestLoomServer:
         app: FastAPI | None,
         num_shafts: int = 24,
         read_initial_state: bool = True,
-        upload_patterns: Iterable[pathlib.Path] = (),
+        upload_patterns: Iterable[Traversable] = (),
+        seed_patterns: Iterable[ReducedPattern] = (),
         reset_db: bool = False,
         db_path: pathlib.Path | str | None = None,
         expected_status_messages: Iterable[str] = (),
@@ -1520,6 +2005,13 @@ class BaseTestLoomServer:
             read_initial_state: If true, read and check the initial server
                 replies from the websocket. This is the most common case.
             upload_patterns: Initial patterns to upload, if any.
+            seed_patterns: Patterns to add directly to the database
+                before the loom server starts, if any. This is much faster
+                than uploading, for tests that do not test uploading.
+                The seeded names are appended to `expected_pattern_names`
+                and, if `expected_current_pattern` is None,
+                the last seeded pattern is expected to be current.
+                Must be empty if `reset_db` is true.
             reset_db: Specify argument `--reset-db`?
                 If False, you should also specify `expected_pattern_names`
             db_path: `--db-path` argument value. If None, use a temp file.
@@ -1535,9 +2027,14 @@ class BaseTestLoomServer:
             expected_current_pattern: Expected_current_pattern.
                 Specify if and only if `db_path` is not None and
                 you expect the database to contain any patterns.
+
+        Raises:
+            ValueError: If `seed_patterns` is not empty and `reset_db` is true.
         """
         expected_pattern_names = list(expected_pattern_names)
-        expected_status_messages = list(expected_status_messages)
+        seed_patterns = list(seed_patterns)
+        if seed_patterns and reset_db:
+            raise ValueError("Cannot specify seed_patterns if reset_db is true")
         if app is None:
             raise AssertionError(
                 "app is None but must be a FastAPI; you must set the app class property in your subclass"
@@ -1545,175 +2042,80 @@ class BaseTestLoomServer:
         with tempfile.TemporaryDirectory() as temp_dir:
             if db_path is None:
                 db_path = pathlib.Path(temp_dir) / "loom_server_database.sqlite"
-            argv = ["testutils", str(num_shafts), "mock", "--verbose", *cls.extra_args]
-            if reset_db:
-                argv.append("--reset-db")
-            argv += ["--db-path", str(db_path)]
-            sys.argv = argv
-
-            with (
-                TestClient(app) as test_client,
-                test_client.websocket_connect("/ws") as websocket,
-            ):
-                loom_server: BaseLoomServer = (
-                    test_client.app.state.loom_server  # type: ignore[attr-defined]
-                )
-                assert loom_server.mock_loom is not None
-                assert loom_server.loom_info.num_shafts == num_shafts
-
-                client = Client(
-                    test_client=test_client,
-                    websocket=websocket,
-                    loom_server=loom_server,
-                    mock_loom=loom_server.mock_loom,
-                )
+            argv = cls.make_argv(num_shafts=num_shafts, reset_db=reset_db, db_path=db_path)
+
+            if seed_patterns:
+                asyncio.run(seed_database(db_path=pathlib.Path(db_path), patterns=seed_patterns))
+                expected_pattern_names += [pattern.name for pattern in seed_patterns]
+                if expected_current_pattern is None:
+                    expected_current_pattern = seed_patterns[-1]
+
+            # The loom server reads its configuration from the command line;
+            # restore the original sys.argv when done.
+            with pytest.MonkeyPatch.context() as monkeypatch:
+                monkeypatch.setattr(sys, "argv", argv)
+                with (
+                    TestClient(app) as test_client,
+                    test_client.websocket_connect("/ws") as websocket,
+                ):
+                    loom_server: BaseLoomServer = (
+                        test_client.app.state.loom_server  # type: ignore[attr-defined]
+                    )
+                    assert loom_server.mock_loom is not None
+                    assert loom_server.loom_info.num_shafts == num_shafts
+
+                    client = Client(
+                        test_client=test_client,
+                        websocket=websocket,
+                        loom_server=loom_server,
+                        mock_loom=loom_server.mock_loom,
+                    )
 
-                if read_initial_state:
-                    seen_types: set[str] = set()
-                    expected_types = {
-                        "Direction",
-                        "JumpEndNumber",
-                        "JumpPickNumber",
-                        "JumpTabbyPickNumber",
-                        "LanguageNames",
-                        "LoomConnectionState",
-                        "LoomInfo",
-                        "Mode",
-                        "PatternNames",
-                        "Settings",
-                        "ShaftState",
-                        "Version",
-                        "WiFi",
-                    }
-                    if expected_status_messages:
-                        expected_types |= {"StatusMessage"}
-                    if expected_current_pattern:
-                        expected_types |= {
-                            "CurrentEndNumber",
-                            "CurrentPickNumber",
-                            "CurrentTabbyPickNumber",
-                            "ReducedPattern",
-                            "SeparateThreadingRepeats",
-                            "SeparateWeavingRepeats",
-                            "ThreadGroupSize",
-                        }
-                    good_connection_states = {
-                        ConnectionStateEnum.CONNECTING,
-                        ConnectionStateEnum.CONNECTED,
-                    }
-                    while True:
-                        reply_dict = client.receive_dict()
-                        reply = SimpleNamespace(**reply_dict)
-                        num_status_messages_seen = 0
-                        match reply.type:
-                            case "CurrentEndNumber":
-                                assert expected_current_pattern is not None
-                                assert reply.end_number0 == expected_current_pattern.end_number0
-                                assert reply.end_number1 == expected_current_pattern.end_number1
-                                assert reply.end_repeat_number == expected_current_pattern.end_repeat_number
-                                assert reply.total_end_number0 == compute_total_num(
-                                    num_within=expected_current_pattern.end_number0,
-                                    repeat_number=expected_current_pattern.end_repeat_number,
-                                    repeat_len=expected_current_pattern.num_ends,
-                                )
-                                assert reply.total_end_number1 == compute_total_num(
-                                    num_within=expected_current_pattern.end_number1,
-                                    repeat_number=expected_current_pattern.end_repeat_number,
-                                    repeat_len=expected_current_pattern.num_ends,
-                                )
-                            case "CurrentPickNumber":
-                                assert expected_current_pattern is not None
-                                assert reply.pick_number == expected_current_pattern.pick_number
-                                assert reply.pick_repeat_number == expected_current_pattern.pick_repeat_number
-                                assert reply.total_pick_number == compute_total_num(
-                                    num_within=expected_current_pattern.pick_number,
-                                    repeat_number=expected_current_pattern.pick_repeat_number,
-                                    repeat_len=len(expected_current_pattern.picks),
-                                )
-                            case "CurrentTabbyPickNumber":
-                                assert expected_current_pattern is not None
-                                assert reply.tabby_pick_number == expected_current_pattern.tabby_pick_number
-                            case "Direction":
-                                assert reply.forward
-                            case "JumpEndNumber":
-                                for field_name in (
-                                    "total_end_number0",
-                                    "total_end_number1",
-                                    "end_number0",
-                                    "end_number1",
-                                    "end_repeat_number",
-                                ):
-                                    assert getattr(reply, field_name) is None
-                            case "JumpPickNumber":
-                                for field_name in ("total_pick_number", "pick_number", "pick_repeat_number"):
-                                    assert getattr(reply, field_name) is None
-                            case "JumpTabbyPickNumber":
-                                assert reply.tabby_pick_number is None
-                            case "LanguageNames":
-                                assert "English" in reply.languages
-                            case "LoomConnectionState":
-                                if reply.state not in good_connection_states:
-                                    raise AssertionError(
-                                        f"Unexpected state in {reply=}; should be in {good_connection_states}"
-                                    )
-                                elif reply.state != ConnectionStateEnum.CONNECTED:
+                    if read_initial_state:
+                        checker = InitialReplyChecker(
+                            loom_server=loom_server,
+                            expected_status_messages=expected_status_messages,
+                            expected_pattern_names=expected_pattern_names,
+                            expected_current_pattern=expected_current_pattern,
+                        )
+                        expected_types = checker.expected_types
+
+                        # Read all initial replies, then check them.
+                        # The number of replies is not fixed (the loom may report
+                        # more than one connection state), so read until every
+                        # expected type has been seen, or an unexpected type arrives.
+                        initial_replies: list[dict[str, Any]] = []
+                        received_types: set[str] = set()
+                        num_types_to_receive = len(expected_types)
+                        num_status_messages_to_receive = len(checker.expected_status_messages)
+                        # Bind invariants to locals, for speed.
+                        receive_dict = client.receive_dict
+                        connected_state = ConnectionStateEnum.CONNECTED
+                        good_connection_states = _GOOD_INITIAL_CONNECTION_STATES
+                        while num_types_to_receive > 0 or num_status_messages_to_receive > 0:
+                            reply = receive_dict()
+                            initial_replies.append(reply)
+                            reply_type = reply["type"]
+                            if reply_type not in expected_types:
+                                break
+                            if reply_type == "StatusMessage":
+                                num_status_messages_to_receive -= 1
+                            elif reply_type == "LoomConnectionState":
+                                # Stop reading on a bad state, rather than waiting
+                                # forever for a CONNECTED state that may never come;
+                                # checker.check reports the bad state.
+                                if reply["state"] not in good_connection_states:
+                                    break
+                                if reply["state"] != connected_state:
                                     continue
-                            case "LoomInfo":
-                                assert vars(reply) == dataclasses.asdict(loom_server.loom_info)
-                            case "Mode":
-                                assert reply.mode == ModeEnum.WEAVE_PATTERN
-                            case "PatternNames":
-                                assert reply.names == expected_pattern_names
-                            case "ReducedPattern":
-                                if not expected_pattern_names:
-                                    raise AssertionError(
-                                        f"Unexpected message type {reply.type} "
-                                        "because expected_current_pattern is None"
-                                    )
-
-                                assert reply.name == expected_pattern_names[-1]
-                            case "SeparateThreadingRepeats":
-                                assert expected_current_pattern is not None
-                                assert reply.separate == expected_current_pattern.separate_threading_repeats
-                            case "SeparateWeavingRepeats":
-                                assert expected_current_pattern is not None
-                                assert reply.separate == expected_current_pattern.separate_weaving_repeats
-                            case "Settings":
-                                assert vars(reply) == dataclasses.asdict(loom_server.settings)
-                            case "ShaftState":
-                                assert reply.state == (
-                                    ShaftStateEnum.DONE
-                                    if loom_server.loom_reports_motion
-                                    else ShaftStateEnum.UNKNOWN
-                                )
-                                assert reply.shaft_word == 0
-                            case "StatusMessage":
-                                num_status_messages_seen += 1
-                                assert reply.message == expected_status_messages[num_status_messages_seen - 1]
-                                assert reply.severity == MessageSeverityEnum.INFO
-                            case "ThreadGroupSize":
-                                assert expected_current_pattern is not None
-                                assert reply.group_size == expected_current_pattern.thread_group_size
-                            case "Version":
-                                assert reply.main_package_name != "?"
-                                assert reply.base_loom_server_version == get_version("base_loom_server")
-                                assert reply.dtx_to_wif_version == get_version("dtx_to_wif")
-                            case "WiFi":
-                                assert not reply.supported
-                            case _:
-                                raise AssertionError(f"Unexpected message type {reply.type}")
-                        seen_types.add(reply.type)
-                        if seen_types == expected_types and num_status_messages_seen == len(
-                            expected_status_messages
-                        ):
-                            break
-
-                expected_names: list[str] = []
-                for filepath in upload_patterns:
-                    expected_names.append(filepath.name)
-                    client.upload_pattern(
-                        filepath=filepath,
-                        expected_names=expected_names,
-                    )
+                            if reply_type not in received_types:
+                                received_types.add(reply_type)
+                                num_types_to_receive -= 1
 
-                yield client
+                        for reply in initial_replies:
+                            checker.check(reply)
+                        checker.check_done()
+
+                    client.upload_patterns(filepaths=upload_patterns, initial_names=expected_pattern_names)
+
+                    yield client
@@ -1,15 +1,20 @@
+import functools
 import html
 import importlib.resources
-import json
 import logging
 from collections.abc import KeysView
 from importlib.resources.abc import Traversable
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads  # type: ignore[assignment]
+
 PKG_FILES = importlib.resources.files("base_loom_server")
 LOCALE_FILES = PKG_FILES.joinpath("locales")
 
 # Translation keys that provide metadata instead of phrases to translate.
-METADATA_KEYS = {"_direction", "_language_code"}
+METADATA_KEYS = frozenset({"_direction", "_language_code"})
 
 
 def get_language_names() -> list[str]:
@@ -17,17 +22,12 @@ def get_language_names() -> list[str]:
 
     Omit "default.json".
     """
-    return sorted(
-        filepath.stem
-        for filepath in LOCALE_FILES.glob("*.json")  # type: ignore[attr-defined]
-        if filepath.stem != "default"
-    )
+    return list(_find_language_names())
 
 
 def get_default_dict() -> dict[str, str]:
     """Get the default translation dict."""
-    filepath = LOCALE_FILES.joinpath("default.json")
-    return _basic_read_one_translation_file(filepath)
+    return dict(_read_default_dict())
 
 
 def get_translation_dict(
@@ -40,6 +40,8 @@ def get_translation_dict(
     """Get the translation dict for the specified language.
 
     All missing phrases use the phrase from "default.json".
+    Dicts read from the default `dir_` are cached, so each language file
+    is only read (and any problems with it logged) once.
 
     Args:
         language: Name of one of the available language files,
@@ -58,8 +60,32 @@ def get_translation_dict(
     if logger is None:
         logger = logging.getLogger()
 
+    if dir_ == LOCALE_FILES:
+        # The locale files are part of the package, so they cannot change while running.
+        return dict(_get_locale_translation_dict(language, html_escape=html_escape, logger=logger))
+    return _make_translation_dict(language, logger=logger, html_escape=html_escape, dir_=dir_)
+
+
+@functools.cache
+def _get_locale_translation_dict(
+    language: str, *, html_escape: bool, logger: logging.Logger
+) -> dict[str, str]:
+    """Make and cache the translation dict for a language file in LOCALE_FILES.
+
+    Do not modify the returned dict.
+    """
+    return _make_translation_dict(language, logger=logger, html_escape=html_escape, dir_=LOCALE_FILES)
+
+
+def _make_translation_dict(
+    language: str, *, logger: logging.Logger, html_escape: bool, dir_: Traversable
+) -> dict[str, str]:
+    """Make the translation dict for the specified language.
+
+    See `get_translation_dict` for details.
+    """
     translation_dict = get_default_dict()
-    valid_keys = set(translation_dict.keys())
+    valid_keys = translation_dict.keys()
 
     language_file = dir_.joinpath(f"{language}.json")
     language_dict = read_one_translation_file(
@@ -71,6 +97,24 @@ def get_translation_dict(
     return translation_dict
 
 
+@functools.cache
+def _find_language_names() -> tuple[str, ...]:
+    """Find and cache the sorted names of the language files in LOCALE_FILES."""
+    return tuple(
+        sorted(
+            filepath.stem
+            for filepath in LOCALE_FILES.glob("*.json")  # type: ignore[attr-defined]
+            if filepath.stem != "default"
+        )
+    )
+
+
+@functools.cache
+def _read_default_dict() -> dict[str, str]:
+    """Read and cache "default.json". Do not modify the returned dict."""
+    return _basic_read_one_translation_file(LOCALE_FILES.joinpath("default.json"))
+
+
 def _basic_read_one_translation_file(translation_file: Traversable) -> dict[str, str]:
     """Read one translation file and return as a dict of phrase: translation.
 
@@ -80,7 +124,8 @@ def _basic_read_one_translation_file(translation_file: Traversable) -> dict[str,
     Args:
         translation_file: Path to translation file.
     """
-    raw_dict = json.loads(translation_file.read_text(encoding="utf_8"))
+    # Both loaders accept UTF-8 encoded bytes; orjson decodes them in C.
+    raw_dict = _json_loads(translation_file.read_bytes())
     return {key: value["message"] for key, value in raw_dict.items()}
 
 
@@ -107,8 +152,13 @@ def read_one_translation_file(
         raise FileNotFoundError(f"Translation file {translation_file} not found")
     logger.info(f"Loading translation file {translation_file}")
     raw_translation_dict = _basic_read_one_translation_file(translation_file)
-    translation_dict = {key: value for key, value in raw_translation_dict.items() if key in valid_keys}
-    extra_keys = raw_translation_dict.keys() - translation_dict.keys()
+    translation_dict: dict[str, str] = {}
+    extra_keys: list[str] = []
+    for key, value in raw_translation_dict.items():
+        if key in valid_keys:
+            translation_dict[key] = value
+        else:
+            extra_keys.append(key)
     if extra_keys:
         extra_keys_str = ", ".join(sorted(extra_keys))
         logger.warning(f"Ignoring invalid keys in {translation_file}: {extra_keys_str}")
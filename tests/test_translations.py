@@ -51,8 +51,9 @@ def test_extra_keys(caplog: pytest.LogCaptureFixture) -> None:
     assert extra_key in raw_extra_data
     assert extra_key not in default_dict
 
-    logger = logging.getLogger()
-    read_one_translation_file(translation_file=filepath, valid_keys=default_dict.keys(), logger=logger)
+    read_one_translation_file(
+        translation_file=filepath, valid_keys=default_dict.keys(), logger=logging.getLogger(__name__)
+    )
     assert len(caplog.record_tuples) > 0
     for _root, level, text in caplog.record_tuples:
         if extra_key in text:
@@ -80,7 +81,6 @@ def test_format() -> None:
 
 def test_missing_file() -> None:
     """Test trying to load a translation file that does not exist."""
-    logger = logging.getLogger()
     language_names = get_language_names()
     missing_name = "unlikely name for a language file"
     assert missing_name not in language_names
@@ -91,8 +91,23 @@ def test_missing_file() -> None:
         read_one_translation_file(
             translation_file=LOCALE_FILES / f"{missing_name}.json",
             valid_keys=default_dict.keys(),
-            logger=logger,
+            logger=logging.getLogger(__name__),
         )
 
     with pytest.raises(FileNotFoundError):
         get_translation_dict(missing_name)
+
+
+def test_translation_dict_cache() -> None:
+    """Test that cached translation dicts are equal but independent."""
+    for html_escape in (False, True):
+        translation_dict1 = get_translation_dict("English", html_escape=html_escape)
+        translation_dict2 = get_translation_dict("English", html_escape=html_escape)
+        assert translation_dict1 == translation_dict2
+        assert translation_dict1 is not translation_dict2
+        translation_dict1["-- added key --"] = "added value"
+        assert "-- added key --" not in get_translation_dict("English", html_escape=html_escape)
+
+    default_dict = get_default_dict()
+    default_dict["-- added key --"] = "added value"
+    assert "-- added key --" not in get_default_dict()
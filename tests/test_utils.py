@@ -77,6 +77,7 @@ def test_compute_total_num() -> None:
         total_num = compute_total_num(num_within, repeat_number, repeat_len)
         assert total_num == (repeat_number - 1) * repeat_len + num_within
 
+    for num_within, repeat_number in itertools.product((-1, 0, 1), (0, 1)):
         with pytest.raises(ValueError):
             compute_total_num(num_within, repeat_number, 0)
 
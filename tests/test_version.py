@@ -1,8 +1,10 @@
+import importlib
+import importlib.util
+
+
 def test_version() -> None:
-    try:
-        import base_loom_server.version  # noqa: PLC0415
-    except ImportError:
-        raise AssertionError("version file not found") from None
+    assert importlib.util.find_spec("base_loom_server.version") is not None, "version file not found"
+    version = importlib.import_module("base_loom_server.version")
 
-    assert base_loom_server.version.__all__ == ["__version__"]
-    assert isinstance(base_loom_server.version.__version__, str)
+    assert version.__all__ == ["__version__"]
+    assert isinstance(version.__version__, str)